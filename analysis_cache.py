@@ -0,0 +1,36 @@
+import json
+import os
+
+# Per-user, never inside the scanned project: a repository must not be able
+# to ship cache entries that get loaded on the reviewer's machine.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "code_analyzer")
+
+
+def _entry_path(namespace, key):
+    return os.path.join(CACHE_DIR, namespace, key + ".json")
+
+
+def load_cached(namespace, key):
+    try:
+        with open(_entry_path(namespace, key), "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(namespace, key, value):
+    cache_path = _entry_path(namespace, key)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        data = json.dumps(value).encode("utf-8")
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # Caching is best effort: a value that cannot be serialised or a full
+        # disk must not fail the analysis or leave a partial entry behind.
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
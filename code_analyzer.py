@@ -2,25 +2,64 @@ import argparse
 import os
 import sys
 import ast
-import time
-import requests
-import pandas as pd
-import toml
+import hashlib
+import queue
+import re
+import threading
+import tokenize
 import difflib
-from radon.complexity import cc_visit
-from radon.metrics import mi_visit
-
-def load_config():
-    config_path = "pyproject.toml"
-
+import csv
+import html
+import io
+import mmap
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from analysis_cache import load_cached, store_cached
+
+MMAP_THRESHOLD = 1024 * 1024
+AI_MAX_CONCURRENCY = 4
+
+POOR_FUNCTION_NAME = "Poor function name"
+MISSING_DOCSTRING = "Missing docstring"
+TOO_MANY_PARAMETERS = "Too many parameters"
+POOR_PARAMETER_NAME = "Poor parameter name"
+POOR_VARIABLE_NAME = "Poor variable name"
+MAGIC_NUMBER_USED = "Magic number used"
+EMPTY_EXCEPT_BLOCK = "Empty except block"
+DEBUG_PRINT_FOUND = "Debug print found"
+UNUSED_VARIABLE = "Unused variable"
+SYNTAX_ERROR = "Syntax Error"
+
+_ALLOWED_NUMBERS = frozenset({0, 1})
+_DEBUG_PRINT_NAMES = frozenset({"print"})
+
+_OPENING_BRACKETS = frozenset({tokenize.LPAR, tokenize.LSQB, tokenize.LBRACE})
+_CLOSING_BRACKETS = frozenset({tokenize.RPAR, tokenize.RSQB, tokenize.RBRACE})
+_TEXT_TOKENS = frozenset({tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)})
+_OPERAND_TOKENS = frozenset({
+    tokenize.NAME, tokenize.NUMBER, tokenize.STRING, getattr(tokenize, "FSTRING_END", tokenize.STRING)
+})
+
+_ISSUE_KEYS = frozenset({"type", "detail", "context", "level"})
+_RESULT_KEYS = frozenset({
+    "file", "functions", "classes", "loops", "conditionals", "ast_complexity", "issues",
+    "ai_feedback", "avg_complexity", "maintainability", "score", "grade", "warnings"
+})
+
+# One suggestion per line, minus any "1.", "-" or "2)" list marker.
+_LIST_ITEM = re.compile(r"^[^\S\n]*+[0-9.\-) ]*+[^\S\n]*(\S.*?)[^\S\n]*$", re.MULTILINE)
+
+@lru_cache(maxsize=1)
+def _load_config(config_path, mtime):
     default_config = {
         "exclude_dirs": ["venv", ".venv", "__pycache__", "anaconda3", "site-packages"],
         "complexity_threshold": 10,
         "maintainability_threshold": 65
     }
 
-    if os.path.exists(config_path):
+    if mtime is not None:
         try:
+            import toml
             data = toml.load(config_path)
             return data.get("tool", {}).get("ai_code_review", default_config)
         except:
@@ -29,27 +68,56 @@ def load_config():
     return default_config
 
 
-def get_python_files(path):
-    python_files = []
+def load_config():
+    config_path = os.path.abspath("pyproject.toml")
+
+    try:
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = None
+
+    return _load_config(config_path, mtime)
+
+
+def _walk(path, ignore_dirs):
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return
+
+    subdirs = []
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in ignore_dirs and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
+
+    for subdir in subdirs:
+        yield from _walk(subdir, ignore_dirs)
 
+
+def get_python_files(path):
     if os.path.isfile(path) and path.endswith(".py"):
         return [path]
     config = load_config()
-    ignore_dirs = config["exclude_dirs"]
-
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
-
-        for file in files:
-            if file.endswith(".py"):
-                python_files.append(os.path.join(root, file))
+    ignore_dirs = frozenset(config["exclude_dirs"])
 
-    return python_files
+    return list(_walk(path, ignore_dirs))
 
 
 def read_file(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            code = f.read().decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                code = str(mm, "utf-8")
+
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    return code
 
 def safe_parse(code):
     try:
@@ -58,159 +126,185 @@ def safe_parse(code):
     except SyntaxError as e:
         return None, f"Syntax Error: {e}"
 
-def extract_structure(tree):
-    structure = {
-        "imports": [],
-        "functions": [],
-        "classes": [],
-        "loops": 0,
-        "conditionals": 0
-    }
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for name in node.names:
-                structure["imports"].append(name.name)
-
-        elif isinstance(node, ast.ImportFrom):
-            structure["imports"].append(node.module)
-
-        elif isinstance(node, ast.FunctionDef):
-            structure["functions"].append(node.name)
-
-        elif isinstance(node, ast.ClassDef):
-            structure["classes"].append(node.name)
-
-        elif isinstance(node, (ast.For, ast.While)):
-            structure["loops"] += 1
+class StructureVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.structure = {
+            "imports": [],
+            "functions": [],
+            "classes": [],
+            "loops": 0,
+            "conditionals": 0
+        }
+        self.complexity = 1
+        self._handlers = {}
+
+    # Walks with an explicit stack rather than recursion so that deeply
+    # nested code (long elif chains, huge expressions) cannot hit the
+    # recursion limit. Handlers schedule children via generic_visit, and
+    # may push a callable to run once those children are done.
+    def visit(self, node):
+        stack = self._stack = [node]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, ast.AST):
+                item()
+                continue
+            handler = self._handlers.get(item.__class__)
+            if handler is None:
+                handler = getattr(self, "visit_" + item.__class__.__name__, self.generic_visit)
+                self._handlers[item.__class__] = handler
+            handler(item)
+
+    def generic_visit(self, node):
+        self._stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    def visit_Import(self, node):
+        for name in node.names:
+            self.structure["imports"].append(name.name)
+
+    def visit_ImportFrom(self, node):
+        self.structure["imports"].append(node.module)
+
+    def visit_FunctionDef(self, node):
+        self.structure["functions"].append(node.name)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        self.structure["classes"].append(node.name)
+        self.generic_visit(node)
+
+    def visit_For(self, node):
+        self.structure["loops"] += 1
+        self.complexity += 1
+        self.generic_visit(node)
+
+    visit_While = visit_For
+
+    def visit_If(self, node):
+        self.structure["conditionals"] += 1
+        self.complexity += 1
+        self.generic_visit(node)
+
+    def visit_Try(self, node):
+        self.complexity += 1
+        self.generic_visit(node)
+
+    visit_BoolOp = visit_Try
 
-        elif isinstance(node, ast.If):
-            structure["conditionals"] += 1
 
-    return structure
+def extract_structure(tree):
+    visitor = StructureVisitor()
+    visitor.visit(tree)
+    return visitor.structure
 
 
 def cyclomatic_complexity_ast(tree):
-    complexity = 1
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.BoolOp)):
-            complexity += 1
-    return complexity
-
-
-def detect_issues(code):
-    raw_issues = []
+    visitor = StructureVisitor()
+    visitor.visit(tree)
+    return visitor.complexity
+
+
+class IssueCollector(StructureVisitor):
+    def __init__(self):
+        super().__init__()
+        self.issues = []
+        self._raw_issues = {}
+        self.current_function = None
+        self.assigned = {}
+        self.used = set()
+        self.parameters = {}
+
+    def _add(self, issue_type, detail, context, level):
+        self._raw_issues[(issue_type, detail, context, level)] = None
+
+    def visit_FunctionDef(self, node):
+        if len(node.name) < 4:
+            self._add(POOR_FUNCTION_NAME, node.name, node.name, "INFO")
+
+        if ast.get_docstring(node) is None:
+            self._add(MISSING_DOCSTRING, node.name, node.name, "INFO")
+
+        if len(node.args.args) > 4:
+            self._add(TOO_MANY_PARAMETERS, node.name, node.name, "WARNING")
+
+        for arg in node.args.args:
+            self.parameters[arg.arg] = node.name
+            if len(arg.arg) < 3:
+                self._add(POOR_PARAMETER_NAME, arg.arg, node.name, "INFO")
+
+        self._stack.append(partial(setattr, self, "current_function", self.current_function))
+        self.current_function = node.name
+        super().visit_FunctionDef(node)
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.assigned[target.id] = self.current_function
+                if len(target.id) < 3:
+                    self._add(POOR_VARIABLE_NAME, target.id, self.current_function, "INFO")
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.used.add(node.id)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, (int, float)) and node.value not in _ALLOWED_NUMBERS:
+            self._add(MAGIC_NUMBER_USED, node.value, self.current_function, "WARNING")
+
+    def visit_ExceptHandler(self, node):
+        if not node.body:
+            self._add(EMPTY_EXCEPT_BLOCK, "", self.current_function, "CRITICAL")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in _DEBUG_PRINT_NAMES:
+            self._add(DEBUG_PRINT_FOUND, "", self.current_function, "INFO")
+        self.generic_visit(node)
+
+    def finish(self):
+        for var, func in self.assigned.items():
+            if var not in self.used and var not in self.parameters:
+                self._add(UNUSED_VARIABLE, var, func, "WARNING")
+
+        self.issues = [
+            {"type": t, "detail": d, "context": c, "level": l}
+            for t, d, c, l in self._raw_issues
+        ]
+
+
+def collect_issues(tree):
+    collector = IssueCollector()
+    collector.visit(tree)
+    collector.finish()
+    return collector
+
+
+def detect_issues(code, tree=None):
+    if tree is None:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return [{"type": SYNTAX_ERROR, "detail": str(e), "context": None, "level": "CRITICAL"}]
 
-    try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
-        return [{"type": "Syntax Error", "detail": str(e), "context": None, "level": "CRITICAL"}]
-
-    assigned = {}
-    used = set()
-    parameters = {}
-    current_function = None
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            current_function = node.name
-
-            if len(node.name) < 4:
-                raw_issues.append({"type": "Poor function name", "detail": node.name, "context": node.name, "level": "INFO"})
-
-            if ast.get_docstring(node) is None:
-                raw_issues.append({"type": "Missing docstring", "detail": node.name, "context": node.name, "level": "INFO"})
-
-            if len(node.args.args) > 4:
-                raw_issues.append({"type": "Too many parameters", "detail": node.name, "context": node.name, "level": "WARNING"})
-
-            for arg in node.args.args:
-                parameters[arg.arg] = current_function
-                if len(arg.arg) < 3:
-                    raw_issues.append({
-                        "type": "Poor parameter name",
-                        "detail": arg.arg,
-                        "context": current_function,
-                        "level": "INFO"
-                    })
-
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    assigned[target.id] = current_function
-                    if len(target.id) < 3:
-                        raw_issues.append({
-                            "type": "Poor variable name",
-                            "detail": target.id,
-                            "context": current_function,
-                            "level": "INFO"
-                        })
-
-        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-            used.add(node.id)
-
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            if node.value not in (0, 1):
-                raw_issues.append({
-                    "type": "Magic number used",
-                    "detail": node.value,
-                    "context": current_function,
-                    "level": "WARNING"
-                })
-
-        if isinstance(node, ast.ExceptHandler):
-            if not node.body:
-                raw_issues.append({
-                    "type": "Empty except block",
-                    "detail": "",
-                    "context": current_function,
-                    "level": "CRITICAL"
-                })
-
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == "print":
-                raw_issues.append({
-                    "type": "Debug print found",
-                    "detail": "",
-                    "context": current_function,
-                    "level": "INFO"
-                })
-
-    for var, func in assigned.items():
-        if var not in used and var not in parameters:
-            raw_issues.append({
-                "type": "Unused variable",
-                "detail": var,
-                "context": func,
-                "level": "WARNING"
-            })
-
-    seen = set()
-    issues = []
-    for i in raw_issues:
-        key = (i["type"], i["detail"], i["context"])
-        if key not in seen:
-            issues.append(i)
-            seen.add(key)
-
-    return issues
+    return collect_issues(tree).issues
 
 def _rule_based_feedback(issues):
     feedback = []
     for issue in issues:
         t = issue["type"]
         ctx = issue["context"]
-        if t == "Missing docstring":
+        if t == MISSING_DOCSTRING:
             feedback.append(f"Add a proper docstring to '{ctx}' explaining its purpose.")
-        elif t == "Too many parameters":
+        elif t == TOO_MANY_PARAMETERS:
             feedback.append(f"Refactor '{ctx}' to reduce parameters using objects.")
-        elif t == "Magic number used":
+        elif t == MAGIC_NUMBER_USED:
             feedback.append("Replace magic numbers with constants.")
-        elif t == "Unused variable":
+        elif t == UNUSED_VARIABLE:
             feedback.append(f"Remove unused variable '{issue['detail']}'.")
-        elif t == "Debug print found":
+        elif t == DEBUG_PRINT_FOUND:
             feedback.append("Remove debug print statements.")
-        elif t == "Poor variable name":
+        elif t == POOR_VARIABLE_NAME:
             feedback.append(f"Rename variable '{issue['detail']}' meaningfully.")
     return feedback
 
@@ -234,14 +328,7 @@ Provide 3-7 concise, actionable suggestions to improve this code. Focus on the m
 
 
 def _parse_ai_response(raw):
-    suggestions = []
-    for line in raw.strip().split("\n"):
-        line = line.strip()
-        if line:
-            cleaned = line.lstrip("0123456789.-) ").strip()
-            if cleaned:
-                suggestions.append(cleaned)
-    return suggestions
+    return _LIST_ITEM.findall(raw)
 
 
 def _call_gemini(prompt, api_key):
@@ -254,9 +341,12 @@ def _call_gemini(prompt, api_key):
     return response.text
 
 
-def _call_openrouter(prompt, api_key):
+def _call_openrouter(prompt, api_key, cancelled):
+    import requests
     model = os.getenv("OPENROUTER_MODEL", "google/gemma-3-4b-it:free")
     for attempt in range(3):
+        if cancelled.is_set():
+            return None
         response = requests.post(
             "https://openrouter.ai/api/v1/chat/completions",
             headers={
@@ -271,8 +361,11 @@ def _call_openrouter(prompt, api_key):
         )
         if response.status_code == 429:
             wait = 10 * (attempt + 1)
+            if cancelled.is_set():
+                return None
             print(f"[WARN] OpenRouter rate limited. Waiting {wait}s...")
-            time.sleep(wait)
+            if cancelled.wait(wait):
+                return None
             continue
         if response.status_code != 200:
             error_msg = response.json().get("error", {}).get("message", response.text[:200])
@@ -282,6 +375,7 @@ def _call_openrouter(prompt, api_key):
 
 
 def _call_ollama(prompt):
+    import requests
     ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
     model = os.getenv("OLLAMA_MODEL", "llama3.2")
     response = requests.post(
@@ -293,65 +387,194 @@ def _call_ollama(prompt):
     return response.json()["response"]
 
 
+def _run_engine(engine_name, call_fn, outcomes):
+    # Parsing happens here so a malformed reply (e.g. a None body from a
+    # blocked Gemini candidate) counts as that engine failing.
+    try:
+        outcomes.put((engine_name, _parse_ai_response(call_fn()), None))
+    except Exception as e:
+        outcomes.put((engine_name, None, e))
+
+
 def generate_ai_feedback(issues, code=""):
     if not issues:
         return ["No issues detected. Code looks good!"]
 
     prompt = _build_prompt(issues, code)
 
-    engines = []
+    cache_key = hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).hexdigest()
+    cached = load_cached("feedback", cache_key)
+    if isinstance(cached, list) and all(isinstance(tip, str) for tip in cached):
+        print("[INFO] Using cached AI feedback.")
+        return cached
+
+    # Set as soon as this call returns so losing engines stop retrying and
+    # stay quiet instead of spilling into later output.
+    cancelled = threading.Event()
+
+    free_engines = []
 
     openrouter_key = os.getenv("OPENROUTER_API_KEY", "").strip()
     if openrouter_key:
-        engines.append(("OpenRouter", lambda: _call_openrouter(prompt, openrouter_key)))
+        free_engines.append(("OpenRouter", lambda: _call_openrouter(prompt, openrouter_key, cancelled)))
 
-    engines.append(("Ollama", lambda: _call_ollama(prompt)))
+    free_engines.append(("Ollama", lambda: _call_ollama(prompt)))
 
+    # Gemini is billed per call, so it only runs once the free engines failed.
+    paid_engines = []
     gemini_key = os.getenv("GEMINI_API_KEY", "").strip()
     if gemini_key:
-        engines.append(("Gemini", lambda: _call_gemini(prompt, gemini_key)))
+        paid_engines.append(("Gemini", lambda: _call_gemini(prompt, gemini_key)))
 
-    for engine_name, call_fn in engines:
-        try:
-            print(f"[INFO] Trying {engine_name}...")
-            raw = call_fn()
-            suggestions = _parse_ai_response(raw)
-            if suggestions:
-                print(f"[INFO] {engine_name} succeeded.")
-                return suggestions
-        except Exception as e:
-            print(f"[WARN] {engine_name} failed: {e}")
+    try:
+        for engines in (free_engines, paid_engines):
+            # Engines race each other; daemon threads let a slow loser be abandoned
+            # instead of holding up the first usable answer (or interpreter exit).
+            outcomes = queue.Queue()
+            for engine_name, call_fn in engines:
+                print(f"[INFO] Trying {engine_name}...")
+                threading.Thread(target=_run_engine, args=(engine_name, call_fn, outcomes), daemon=True).start()
+
+            for _ in engines:
+                engine_name, suggestions, error = outcomes.get()
+                if error is not None:
+                    print(f"[WARN] {engine_name} failed: {error}")
+                    continue
+                if suggestions:
+                    print(f"[INFO] {engine_name} succeeded.")
+                    store_cached("feedback", cache_key, suggestions)
+                    return suggestions
+    finally:
+        cancelled.set()
 
     print("[INFO] All AI engines failed. Using rule-based feedback.")
     return _rule_based_feedback(issues)
 
+def is_rule_based_feedback(result):
+    return result["ai_feedback"] == "; ".join(_rule_based_feedback(result["issues"]))
+
+def _matching_paren(tokens, open_index):
+    depth = 0
+    for index in range(open_index, len(tokens)):
+        kind = tokens[index].exact_type
+        if kind in _OPENING_BRACKETS:
+            depth += 1
+        elif kind in _CLOSING_BRACKETS:
+            depth -= 1
+            if depth == 0:
+                return index
+    return None
+
+
+def _set_gap(edits, before, after, text):
+    if before.end[0] == after.start[0] and before.end[1] != after.start[1] - len(text):
+        edits[(before.end[0], before.end[1])] = (after.start[1], text)
+
+
+def _tidy_print_call(tokens, open_index, close_index, edits):
+    for index in range(open_index + 1, close_index + 1):
+        token = tokens[index]
+        previous = tokens[index - 1]
+
+        if token.exact_type == tokenize.RPAR:
+            _set_gap(edits, previous, token, "")
+
+        elif token.exact_type == tokenize.PLUS and (
+            previous.type in _OPERAND_TOKENS
+            or previous.exact_type in _CLOSING_BRACKETS
+        ):
+            _set_gap(edits, previous, token, " ")
+            _set_gap(edits, token, tokens[index + 1], " ")
+
+
 def auto_fix_code(code):
     lines = code.split("\n")
-    fixed_lines = []
 
-    for line in lines:
-        stripped = line.strip()
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return "\n".join(line.rstrip() for line in lines)
+
+    dropped_rows = set()
+    placeholders = {}
+    edits = {}
+    # One entry per open indented block: [has a kept statement, first dropped print].
+    blocks = []
+    statement_start = True
+
+    for index, token in enumerate(tokens):
+        if token.type in (tokenize.NL, tokenize.COMMENT):
+            continue
+
+        if token.type == tokenize.INDENT:
+            blocks.append([False, None])
+        elif token.type == tokenize.DEDENT:
+            kept, first_drop = blocks.pop()
+            if not kept and first_drop is not None:
+                placeholders[first_drop.start[0]] = first_drop.start[1]
+
+        at_statement_start = statement_start
+        statement_start = token.type in (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT)
 
-        if stripped.startswith("print(") and (
-            "debug" in stripped.lower()
-            or "test" in stripped.lower()
+        if not (
+            token.type == tokenize.NAME
+            and token.string == "print"
+            and tokens[index + 1].exact_type == tokenize.LPAR
         ):
+            if at_statement_start and not statement_start and blocks:
+                blocks[-1][0] = True
+            continue
+
+        close_index = _matching_paren(tokens, index + 1)
+        if close_index is None:
             continue
 
-        if "print(" in line:
-            line = line.replace("print(", "print(")
-            line = line.replace(" )", ")")
-            line = line.replace("+", " + ")
+        following = tokens[close_index + 1]
+        if following.type == tokenize.COMMENT:
+            following = tokens[close_index + 2]
 
-        fixed_lines.append(line.rstrip())
+        is_debug_print = at_statement_start and following.type in (tokenize.NEWLINE, tokenize.ENDMARKER) and any(
+            tok.type in _TEXT_TOKENS and ("debug" in tok.string.lower() or "test" in tok.string.lower())
+            for tok in tokens[index + 2:close_index]
+        )
+
+        if is_debug_print:
+            dropped_rows.update(range(token.start[0], tokens[close_index].end[0] + 1))
+            if blocks and blocks[-1][1] is None:
+                blocks[-1][1] = token
+        else:
+            if at_statement_start and blocks:
+                blocks[-1][0] = True
+            _tidy_print_call(tokens, index + 1, close_index, edits)
+
+    for (row, start_col), (end_col, text) in sorted(edits.items(), reverse=True):
+        line = lines[row - 1]
+        lines[row - 1] = line[:start_col] + text + line[end_col:]
+
+    for row, col in placeholders.items():
+        lines[row - 1] = lines[row - 1][:col] + "pass"
+        dropped_rows.discard(row)
+
+    return "\n".join(
+        line.rstrip()
+        for row, line in enumerate(lines, start=1)
+        if row not in dropped_rows
+    )
 
-    return "\n".join(fixed_lines)
 
+def analyze_metrics(tree, code):
+    from radon.metrics import h_visit_ast, mi_compute
+    from radon.raw import analyze
+    from radon.visitors import ComplexityVisitor
 
-def analyze_metrics(code):
     try:
-        complexity_results = cc_visit(code)
-        maintainability = mi_visit(code, True)
+        visitor = ComplexityVisitor.from_ast(tree)
+        complexity_results = visitor.blocks
+
+        raw = analyze(code)
+        comment_lines = raw.comments + raw.multi
+        comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+        maintainability = mi_compute(h_visit_ast(tree).total.volume, visitor.total_complexity, raw.lloc, comments)
     except:
         return 0, 0, 0, "Error", []
 
@@ -389,6 +612,9 @@ def analyze_metrics(code):
     return round(avg_complexity, 2), round(maintainability, 2), score, grade, warnings
 
 def generate_diff(original, fixed):
+    if original == fixed:
+        return ""
+
     return "\n".join(difflib.unified_diff(
         original.splitlines(),
         fixed.splitlines(),
@@ -409,16 +635,28 @@ def create_git_hook():
     hook_script_path = os.path.join(git_dir, "hooks", "pre-commit-script.py")
 
     python_script = """import subprocess
+import hashlib
+import json
 import os
 import sys
 
 print("Running AI Code Review on staged files...")
 
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "code_analyzer")
+
+def read_bytes(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
 result = subprocess.run(
     ["git", "diff", "--cached", "--name-only", "--diff-filter=ACM"],
     capture_output=True,
     text=True,
-    cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    cwd=root
 )
 
 files = [f for f in result.stdout.strip().split("\\n") if f.endswith(".py") and f]
@@ -427,14 +665,41 @@ if not files:
     print("No Python files to check.")
     sys.exit(0)
 
+analyzer = hashlib.sha1()
+analyzer.update(read_bytes(os.path.join(root, "code_analyzer.py")))
+analyzer.update(read_bytes(os.path.join(root, "analysis_cache.py")))
+
 failed = False
 for file in files:
+    digest = analyzer.copy()
+    digest.update(read_bytes(os.path.join(root, file)))
+    cache_path = os.path.join(cache_dir, digest.hexdigest() + ".json")
+
+    # Only passes are remembered: a failing scan exits 1 just like a crash
+    # (traceback, missing dependency, Ctrl-C), so failures always re-run
+    # and show their output.
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            if json.load(f)["returncode"] == 0:
+                print(f"{file}: unchanged since it last passed review")
+                continue
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
     proc = subprocess.run(
         [sys.executable, "code_analyzer.py", "scan", "--path", file],
-        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        cwd=root
     )
     if proc.returncode != 0:
         failed = True
+        continue
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"returncode": 0}, f)
+    except OSError:
+        pass
 
 if failed:
     print("Commit blocked: Code issues found.")
@@ -468,74 +733,166 @@ exit $?
         print("Error installing hook:", e)
 
 
-def analyze_project(project_path):
+def write_csv_report(results, csv_path):
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_html_report(results, html_path):
+    columns = list(results[0])
+
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write('<table border="1" class="dataframe">\n  <thead>\n    <tr style="text-align: right;">\n')
+        for column in columns:
+            f.write(f"      <th>{html.escape(column, quote=False)}</th>\n")
+        f.write("    </tr>\n  </thead>\n  <tbody>\n")
+
+        for row in results:
+            f.write("    <tr>\n")
+            for column in columns:
+                f.write(f"      <td>{html.escape(str(row[column]), quote=False)}</td>\n")
+            f.write("    </tr>\n")
+
+        f.write("  </tbody>\n</table>")
+
+
+def _analyze_source(path, code):
+    try:
+        tree = ast.parse(code, filename=path)
+    except SyntaxError as e:
+        return {
+            "file": path,
+            "functions": 0,
+            "classes": 0,
+            "loops": 0,
+            "conditionals": 0,
+            "ast_complexity": 0,
+            "issues": [{"type": SYNTAX_ERROR, "detail": str(e), "context": None, "level": "CRITICAL"}],
+            "ai_feedback": "Fix syntax errors before analysis",
+            "avg_complexity": 0,
+            "maintainability": 0,
+            "score": 0,
+            "grade": "Error",
+            "warnings": f"Syntax Error: {e}"
+        }
+
+    collector = collect_issues(tree)
+    structure = collector.structure
+
+    avg_complexity, mi, score, grade, warnings = analyze_metrics(tree, code)
+
+    return {
+        "file": path,
+        "functions": len(structure["functions"]),
+        "classes": len(structure["classes"]),
+        "loops": structure["loops"],
+        "conditionals": structure["conditionals"],
+        "ast_complexity": collector.complexity,
+        "issues": collector.issues,
+        "ai_feedback": None,
+        "avg_complexity": avg_complexity,
+        "maintainability": mi,
+        "score": score,
+        "grade": grade,
+        "warnings": "; ".join(warnings)
+    }
+
+
+def _is_result(value):
+    return (
+        isinstance(value, dict)
+        and value.keys() == _RESULT_KEYS
+        and isinstance(value["issues"], list)
+        and all(isinstance(issue, dict) and issue.keys() == _ISSUE_KEYS for issue in value["issues"])
+    )
+
+
+@lru_cache(maxsize=1)
+def _analyzer_fingerprint():
+    from importlib import metadata
+
+    # Any edit to the rules or a radon upgrade must invalidate cached results.
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module in ("code_analyzer.py", "analysis_cache.py"):
+        with open(os.path.join(here, module), "rb") as f:
+            digest.update(f.read())
+    try:
+        digest.update(metadata.version("radon").encode())
+    except metadata.PackageNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+def _analyze_one_file(path, code):
+    key = hashlib.sha256(f"{_analyzer_fingerprint()}\0{code}".encode("utf-8", "surrogatepass")).hexdigest()
+
+    result = load_cached("results", key)
+    if _is_result(result):
+        result["file"] = path
+        return result, True
+
+    result = _analyze_source(path, code)
+    if result["grade"] != "Error":
+        store_cached("results", key, result)
+    return result, False
+
 
+def load_sources(project_path):
     files = get_python_files(project_path)
 
-    if not files:
-        return None, None, "No Python files found"
-
-    results = []
-
-    for file in files:
-        code = read_file(file)
-
-        tree, error = safe_parse(code)
-        if error:
-            results.append({
-                "file": file,
-                "functions": 0,
-                "classes": 0,
-                "loops": 0,
-                "conditionals": 0,
-                "ast_complexity": 0,
-                "issues": [("Syntax error in file", "CRITICAL")],
-                "ai_feedback": "Fix syntax errors before analysis",
-                "avg_complexity": 0,
-                "maintainability": 0,
-                "score": 0,
-                "grade": "Error",
-                "warnings": error
-            })
-            continue
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            return dict(zip(files, executor.map(read_file, files)))
+
+    return {file: read_file(file) for file in files}
+
+
+def analyze_project(project_path, sources=None, mp_context=None):
+    import pandas as pd
+
+    if sources is None:
+        sources = load_sources(project_path)
+
+    if not sources:
+        return None, None, None, "No Python files found"
+
+    files = list(sources)
+    codes = list(sources.values())
 
-        structure = extract_structure(tree)
-        ast_complexity = cyclomatic_complexity_ast(tree)
-        issues = detect_issues(code)
-        ai_feedback = generate_ai_feedback(issues, code)
-
-        avg_complexity, mi, score, grade, warnings = analyze_metrics(code)
-
-        results.append({
-            "file": file,
-            "functions": len(structure["functions"]),
-            "classes": len(structure["classes"]),
-            "loops": structure["loops"],
-            "conditionals": structure["conditionals"],
-            "ast_complexity": ast_complexity,
-            "issues": issues,
-            "ai_feedback": "; ".join(ai_feedback),
-            "avg_complexity": avg_complexity,
-            "maintainability": mi,
-            "score": score,
-            "grade": grade,
-            "warnings": "; ".join(warnings)
-        })
+    if len(files) > 1:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=mp_context) as executor:
+            analyzed = list(executor.map(_analyze_one_file, files, codes, chunksize=4))
+    else:
+        analyzed = [_analyze_one_file(file, code) for file, code in zip(files, codes)]
+
+    results = [result for result, _ in analyzed]
+    cache_hits = sum(cached for _, cached in analyzed)
+
+    pending = [(result, code) for result, code in zip(results, codes) if result["ai_feedback"] is None]
+    with ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY) as executor:
+        feedback = executor.map(lambda item: generate_ai_feedback(item[0]["issues"], item[1]), pending)
+        for (result, _), suggestions in zip(pending, feedback):
+            result["ai_feedback"] = "; ".join(suggestions)
+
+    print(f"[INFO] Cache: {cache_hits} hit(s), {len(files) - cache_hits} miss(es)")
 
     df = pd.DataFrame(results)
 
-    project_score = round(df["score"].mean(), 2)
+    project_score = round(sum(r["score"] for r in results) / len(results), 2)
 
     save_dir = os.path.dirname(project_path) if os.path.isfile(project_path) else project_path
 
     csv_path = os.path.join(save_dir, "report.csv")
     html_path = os.path.join(save_dir, "report.html")
 
-    df.to_csv(csv_path, index=False)
-    df.to_html(html_path, index=False)
+    write_csv_report(results, csv_path)
+    write_html_report(results, html_path)
 
 
-    return df, project_score, "Analysis completed successfully"
+    return df, results, project_score, "Analysis completed successfully"
 
 def run_cli():
     parser = argparse.ArgumentParser(description="AI Code Quality Analyzer")
@@ -544,19 +901,16 @@ def run_cli():
 
     args = parser.parse_args()
 
-    df, score, msg = analyze_project(args.path)
+    sources = load_sources(args.path)
+    df, results, score, msg = analyze_project(args.path, sources)
 
     if args.command == "scan":
         print(df)
 
-        critical_found = False
-
-        for _, row in df.iterrows():
-            if row["grade"] == "Error":
-                critical_found = True
-
-            if "CRITICAL" in str(row["warnings"]):
-                critical_found = True
+        critical_found = any(
+            row["grade"] == "Error" or "CRITICAL" in str(row["warnings"])
+            for row in results
+        )
 
         if critical_found:
             print("❌ Critical issues found. Fix before commit.")
@@ -566,26 +920,27 @@ def run_cli():
 
 
     elif args.command == "review":
-        for _, row in df.iterrows():
+        for row in results:
             print("\nFile:", row["file"])
             print(row["ai_feedback"])
 
     elif args.command == "apply":
-        for file in get_python_files(args.path):
-            code = read_file(file)
+        for file, code in sources.items():
             fixed = auto_fix_code(code)
-            with open(file, "w", encoding="utf-8") as f:
-                f.write(fixed)
+            if fixed != code:
+                with open(file, "w", encoding="utf-8") as f:
+                    f.write(fixed)
         print("Auto fixes applied.")
 
     elif args.command == "report":
         print("Project Score:", score)
 
     elif args.command == "diff":
-        for file in get_python_files(args.path):
-            original = read_file(file)
+        for file, original in sources.items():
             fixed = auto_fix_code(original)
-            print(generate_diff(original, fixed))
+            diff = generate_diff(original, fixed)
+            if diff:
+                print(diff)
 
     elif args.command == "hook":
         create_git_hook()
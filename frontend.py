@@ -1,8 +1,21 @@
 import streamlit as st
+import atexit
+import multiprocessing
 import os
+import shutil
 import tempfile
+import zipfile
+import zlib
 import pandas as pd
-from code_analyzer import analyze_project, auto_fix_code, generate_diff, get_python_files, read_file, create_git_hook
+from code_analyzer import analyze_project, auto_fix_code, generate_diff, get_python_files, is_rule_based_feedback, read_file, create_git_hook
+
+# Limits on what a zip upload may expand to, so an archive cannot fill the
+# server's temp disk.
+MAX_ZIP_MEMBERS = 1000
+MAX_ZIP_MEMBER_SIZE = 5 * 1024 * 1024
+MAX_ZIP_TOTAL_SIZE = 50 * 1024 * 1024
+
+_ISSUE_TMPL = "- **{type}** | Detail: `{detail}` | Context: `{context}` | Level: `{level}`"
 
 st.set_page_config(
     page_title="🧠 AI Code Quality Analyzer",
@@ -12,48 +25,166 @@ st.set_page_config(
 
 st.title("🧠 AI Code Quality Analyzer")
 
+@st.cache_resource
+def _temp_root():
+    path = tempfile.mkdtemp(prefix="code_analyzer_")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+def new_temp_dir():
+    return tempfile.mkdtemp(dir=_temp_root())
+
+def new_project_folder(batch_key, file_count):
+    # The folder only stages the current inputs (analysis copies them), so
+    # the previous one can go as soon as the inputs change.
+    if "session_path" in st.session_state:
+        shutil.rmtree(st.session_state.session_path, ignore_errors=True)
+    st.session_state.session_path = new_temp_dir()
+    st.session_state.batch_key = batch_key
+    st.session_state.file_count = file_count
+    return st.session_state.session_path
+
 if "session_path" not in st.session_state:
-    st.session_state.session_path = tempfile.mkdtemp()
+    new_project_folder(None, 0)
 
 PROJECT_PATH = st.session_state.session_path
 
-def clear_project_folder():
-    for file in os.listdir(PROJECT_PATH):
-        file_path = os.path.join(PROJECT_PATH, file)
-        if os.path.isfile(file_path):
-            os.remove(file_path)
+# Bounded so a long-running server does not keep every analysis forever.
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def _cached_analyze(files_blob):
+    analysis_path = new_temp_dir()
+    csv_report = html_report = None
+    try:
+        for name, data in files_blob:
+            file_path = os.path.join(analysis_path, name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(data)
+        # Forking a process that already runs Streamlit's server threads is
+        # unsafe, so the analysis workers are spawned instead.
+        df, results, project_score, msg = analyze_project(
+            analysis_path, mp_context=multiprocessing.get_context("spawn")
+        )
+        if df is not None:
+            csv_report = df.to_csv(index=False).encode("utf-8")
+            with open(os.path.join(analysis_path, "report.html"), "rb") as f:
+                html_report = f.read()
+    finally:
+        # The reports are kept in memory, so nothing on disk outlives the call.
+        shutil.rmtree(analysis_path, ignore_errors=True)
+    for row in results or []:
+        tips = str(row["ai_feedback"] or "").split(";")
+        row["ai_feedback_tips"] = [tip.strip() for tip in tips if tip.strip()]
+    return df, results, project_score, msg, csv_report, html_report
+
+def extract_python_files(archive, dest):
+    with zipfile.ZipFile(archive) as z:
+        members = []
+        total_size = 0
+        for member in z.infolist():
+            name = os.path.normpath(member.filename)
+            if member.is_dir() or not name.endswith(".py"):
+                continue
+            if os.path.isabs(name) or name.split(os.sep)[0] == "..":
+                continue
+            # zipfile never yields more than file_size bytes for a member,
+            # so the declared sizes bound what extraction can write.
+            if member.file_size > MAX_ZIP_MEMBER_SIZE:
+                raise ValueError(f"{name} is larger than {MAX_ZIP_MEMBER_SIZE // (1024 * 1024)} MiB")
+            total_size += member.file_size
+            if total_size > MAX_ZIP_TOTAL_SIZE:
+                raise ValueError(f"Python files exceed {MAX_ZIP_TOTAL_SIZE // (1024 * 1024)} MiB in total")
+            members.append((member, name))
+            if len(members) > MAX_ZIP_MEMBERS:
+                raise ValueError(f"more than {MAX_ZIP_MEMBERS} Python files")
+
+        extracted = 0
+        skipped = []
+        for member, name in members:
+            file_path = os.path.join(dest, name)
+            if os.path.exists(file_path):
+                skipped.append(name)
+                continue
+            try:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with z.open(member) as src, open(file_path, "wb") as f:
+                    shutil.copyfileobj(src, f, length=1024 * 1024)
+            except (OSError, zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError):
+                # A name clash with a directory, a CRC mismatch, encryption or
+                # an unsupported method: skip the member, keep nothing partial.
+                if os.path.isfile(file_path):
+                    os.remove(file_path)
+                skipped.append(name)
+                continue
+            extracted += 1
+    return extracted, skipped
+
+def project_files_blob():
+    blob = []
+    for path in get_python_files(PROJECT_PATH):
+        with open(path, "rb") as f:
+            blob.append((os.path.relpath(path, PROJECT_PATH), f.read()))
+    return tuple(sorted(blob))
 
 st.subheader("📥 Upload Python File(s) or Paste Code")
 
 uploaded_files = st.file_uploader(
-    "Upload Python file(s)", type=["py"], accept_multiple_files=True
+    "Upload Python file(s) or a .zip of them", type=["py", "zip"], accept_multiple_files=True
 )
 
 code_input = st.text_area("Or paste Python code here", height=300)
 
 if uploaded_files:
-    clear_project_folder()
-    for uploaded_file in uploaded_files:
-        file_path = os.path.join(PROJECT_PATH, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.read())
-    st.success(f"{len(uploaded_files)} file(s) ready for analysis")
+    batch_key = tuple(uploaded_file.file_id for uploaded_file in uploaded_files)
+    if batch_key != st.session_state.batch_key:
+        PROJECT_PATH = new_project_folder(batch_key, 0)
+        skipped = []
+        for uploaded_file in uploaded_files:
+            if uploaded_file.name.endswith(".zip"):
+                try:
+                    extracted, archive_skipped = extract_python_files(uploaded_file, PROJECT_PATH)
+                except zipfile.BadZipFile:
+                    st.warning(f"{uploaded_file.name} is not a valid zip archive")
+                    continue
+                except ValueError as e:
+                    st.warning(f"{uploaded_file.name} was not extracted: {e}")
+                    continue
+                st.session_state.file_count += extracted
+                skipped.extend(archive_skipped)
+                continue
+            file_path = os.path.join(PROJECT_PATH, uploaded_file.name)
+            if os.path.exists(file_path):
+                skipped.append(uploaded_file.name)
+                continue
+            with open(file_path, "wb") as f:
+                shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+            st.session_state.file_count += 1
+        if skipped:
+            st.warning(f"Skipped duplicate or unreadable file(s): {', '.join(skipped)}")
+    st.success(f"{st.session_state.file_count} file(s) ready for analysis")
 
 elif code_input.strip():
-    clear_project_folder()
-    file_path = os.path.join(PROJECT_PATH, "input_code.py")
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(code_input)
+    if code_input != st.session_state.batch_key:
+        PROJECT_PATH = new_project_folder(code_input, 1)
+        file_path = os.path.join(PROJECT_PATH, "input_code.py")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(code_input)
     st.success("Code ready for analysis")
 
 if st.button("🔍 Analyze Code Quality"):
 
-    if len(os.listdir(PROJECT_PATH)) == 0:
+    if st.session_state.file_count == 0:
         st.warning("Please upload or paste Python code first.")
         st.stop()
 
     with st.spinner("🤖 Analyzing code with AI... This may take a moment."):
-        df, project_score, msg = analyze_project(PROJECT_PATH)
+        files_blob = project_files_blob()
+        df, results, project_score, msg, csv_report, html_report = _cached_analyze(files_blob)
+
+    # Rule-based fallback means the AI engines were unavailable; drop the
+    # cached entry so the next click tries them again.
+    if results and any(is_rule_based_feedback(row) for row in results):
+        _cached_analyze.clear(files_blob)
 
     if df is None:
         st.error(msg)
@@ -67,92 +198,71 @@ if st.button("🔍 Analyze Code Quality"):
     m1.metric("Project Score", project_score)
     m2.metric("Files Analyzed", len(df))
 
-    total_issues = sum(len(x) if isinstance(x, list) else 0 for x in df["issues"])
+    total_issues = int(df["issues"].str.len().sum())
     m3.metric("Total Issues", total_issues)
 
 
     st.subheader("📄 File Analysis")
 
-    for index, row in df.iterrows():
-        with st.expander(f"📁 {os.path.basename(row['file'])}"):
-
-            st.markdown("### 📊 Code Structure")
-            st.markdown(
-                f"""
-- **Functions:** {row['functions']}
-- **Classes:** {row['classes']}
-- **Loops:** {row['loops']}
-- **Conditionals:** {row['conditionals']}
-"""
-            )
-
-            st.markdown("### ⚙ Complexity Metrics")
-            st.markdown(
-                f"""
-- **AST Complexity:** {row.get('ast_complexity', 0)}
-- **Average Complexity:** {row.get('avg_complexity',0)}
-- **Maintainability Index:** {row.get('maintainability',0)}
-"""
-            )
-
-            st.markdown("### 🧾 Quality Score")
-            st.markdown(
-                f"""
-- **Score:** {row.get('score','')}
-- **Grade:** {row.get('grade','')}
-"""
-            )
+    metric_columns = [
+        "file", "functions", "classes", "loops", "conditionals",
+        "ast_complexity", "avg_complexity", "maintainability", "score", "grade"
+    ]
+    st.dataframe(
+        df[metric_columns].assign(file=df["file"].map(os.path.basename)),
+        use_container_width=True,
+        hide_index=True
+    )
 
-            st.markdown(f"**Warnings:** {row.get('warnings','None')}")
+    markdown = st.markdown
+    expander = st.expander
 
-            issues = row.get("issues", [])
-            st.markdown("### 🚨 Detected Issues")
+    for row in results:
+        with expander(f"📁 {os.path.basename(row['file'])}"):
 
+            issues = row["issues"]
             if issues:
-                for issue in issues:
-                    if isinstance(issue, dict):
-                        st.markdown(
-                            f"- **{issue['type']}** | Detail: `{issue['detail']}` | Context: `{issue['context']}` | Level: `{issue['level']}`"
-                        )
-                    else:
-                        st.markdown(f"- {issue}")
+                issues_md = "\n".join(map(_ISSUE_TMPL.format_map, issues))
             else:
-                st.markdown("- No issues detected")
+                issues_md = "- No issues detected"
 
-            st.markdown("### 🤖 AI Suggestions")
-            if row.get("ai_feedback"):
-                for tip in str(row["ai_feedback"]).split(";"):
-                    st.markdown(f"- {tip.strip()}")
+            if row["ai_feedback_tips"]:
+                tips_md = "\n".join(f"- {tip}" for tip in row["ai_feedback_tips"])
             else:
-                st.markdown("- No suggestions")
+                tips_md = "- No suggestions"
+
+            markdown(
+                f"""
+**Warnings:** {row['warnings']}
+
+### 🚨 Detected Issues
+{issues_md}
+
+### 🤖 AI Suggestions
+{tips_md}
+"""
+            )
 
     st.divider()
 
     st.subheader("📥 Download Reports")
     col1, col2 = st.columns(2)
 
-    csv_path = os.path.join(PROJECT_PATH, "report.csv")
-    html_path = os.path.join(PROJECT_PATH, "report.html")
-
-    if os.path.exists(csv_path):
-        with col1:
-            with open(csv_path, "rb") as f:
-                st.download_button(
-                    "Download CSV Report",
-                    f,
-                    file_name="report.csv",
-                    use_container_width=True
-                )
-
-    if os.path.exists(html_path):
-        with col2:
-            with open(html_path, "rb") as f:
-                st.download_button(
-                    "Download HTML Report",
-                    f,
-                    file_name="report.html",
-                    use_container_width=True
-                )
+    with col1:
+        st.download_button(
+            "Download CSV Report",
+            csv_report,
+            file_name="report.csv",
+            use_container_width=True
+        )
+
+    with col2:
+        st.download_button(
+            "Download HTML Report",
+            html_report,
+            file_name="report.html",
+            use_container_width=True
+        )
 
 with st.expander("Detailed explanation of each field"):
     st.markdown("""